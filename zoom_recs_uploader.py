@@ -1,32 +1,68 @@
 import os
 import json
+import atexit
+import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
 import logging
+import logging.handlers
 import argparse
+import time
+import glob
+import mimetypes
+import queue
+import functools
+import itertools
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta  # pip install python-dateutil
 from dotenv import load_dotenv
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaUpload
 from tqdm import tqdm
 import re
 
+try:
+    import orjson  # optional, faster JSON for state/cache files
+except ImportError:
+    orjson = None
+
 # ------------------------------------------------------------------------------
 # Constants
 # ------------------------------------------------------------------------------
 PROCESSING_DAYS = 60
 DELETE_AFTER_DAYS = 365 
 LOG_RETENTION_DAYS = 180
+ZOOM_LIST_WORKERS = 4          # monthly chunks listed in parallel (kept low for Zoom rate limits)
+DELETE_WORKERS = 10            # concurrent Zoom recording deletions
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024  # bytes per resumable upload request (multiple of 256 KiB)
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024  # bytes per chunk handed from the Zoom reader to the uploader
+STREAM_QUEUE_CHUNKS = 8        # chunks buffered per transfer (bounds RAM to 8 x 4 MiB)
+DRIVE_NUM_RETRIES = 5          # exponential-backoff retries on Drive 429/5xx
+DRIVE_BATCH_SIZE = 100         # max calls per Drive batch request
+STATE_FLUSH_EVERY = 32         # processed meetings buffered per state DB write
+WATERMARK_OVERLAP_DAYS = 7     # re-list this many days before the newest handled recording
+PROGRESS_MININTERVAL = 1.0     # seconds between progress bar redraws
+FOLDER_CACHE_FLUSH_EVERY = 50  # new folder ids between folder_cache.json saves
+
+# sanitize_filename: drop characters invalid in file names, then spell out
+# '&' / '%' and replace spaces in a single str.translate pass
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*\']')
+_FILENAME_TRANSLATION = str.maketrans({"&": "and", "%": "percent", " ": "_"})
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LOG_FILE = os.path.join(BASE_DIR, "script.log")
-STATE_FILE = os.path.join(BASE_DIR, "processed_recordings.json")
+STATE_FILE = os.path.join(BASE_DIR, "processed_recordings.json")  # legacy, migrated into STATE_DB_FILE
+STATE_DB_FILE = os.path.join(BASE_DIR, "processed_recordings.db")
 RUN_COUNT_FILE = os.path.join(BASE_DIR, "run_count.json")
-DOWNLOAD_DIR = os.path.join(BASE_DIR, "downloads")
-
-os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+FOLDER_CACHE_FILE = os.path.join(BASE_DIR, "folder_cache.json")
+TOKEN_CACHE_FILE = os.path.join(BASE_DIR, "token_cache.json")
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry when a cached Zoom token is renewed
 
 load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
 
@@ -35,105 +71,269 @@ GOOGLE_DRIVE_PARENT_ID = os.getenv("GOOGLE_DRIVE_PARENT_ID")
 ZOOM_CLIENT_ID = os.getenv("ZOOM_CLIENT_ID")
 ZOOM_CLIENT_SECRET = os.getenv("ZOOM_CLIENT_SECRET")
 ZOOM_ACCOUNT_ID = os.getenv("ZOOM_ACCOUNT_ID")
+TRANSFER_WORKERS = int(os.getenv("WORKERS", "4"))  # parallel Zoom -> Drive transfers (= concurrent Zoom downloads)
 
 SCOPES = ["https://www.googleapis.com/auth/drive.file"]
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
 
 if not all([SERVICE_ACCOUNT_FILE, GOOGLE_DRIVE_PARENT_ID, ZOOM_CLIENT_ID, ZOOM_CLIENT_SECRET, ZOOM_ACCOUNT_ID]):
     raise ValueError("Missing required environment variables. Check your .env file.")
 
 credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-drive_service = build("drive", "v3", credentials=credentials)
+
+_thread_local = threading.local()
+
+def get_drive_service():
+    """
+    Return the Drive client of the current thread (googleapiclient is not thread-safe).
+    """
+    service = getattr(_thread_local, "drive_service", None)
+    if service is None:
+        service = build("drive", "v3", credentials=credentials)
+        _thread_local.drive_service = service
+    return service
+
+def get_zoom_session():
+    """
+    Return the keep-alive Zoom session of the current thread, so TLS connections
+    are reused without threads contending for one connection pool.
+    Retries 429/5xx with backoff and re-authenticates once on 401.
+    """
+    session = getattr(_thread_local, "zoom_session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST", "DELETE"],
+            raise_on_status=False
+        )))
+        session.hooks["response"].append(reauth_on_401)
+        _thread_local.zoom_session = session
+    return session
+
+def prune_rotated_logs():
+    """
+    Delete rotated log files last written more than LOG_RETENTION_DAYS ago.
+    """
+    cutoff = time.time() - LOG_RETENTION_DAYS * 86400
+    for path in glob.glob(glob.escape(LOG_FILE) + ".*"):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
 
 def setup_logging():
     """
-    Configure logging with rotation and cleanup.
+    Configure logging with daily rotation; rotated files older than
+    LOG_RETENTION_DAYS are deleted at startup.
     """
+    prune_rotated_logs()
     logging.basicConfig(
         level=logging.DEBUG,
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[
-            logging.FileHandler(LOG_FILE, mode="a"),
+            logging.handlers.TimedRotatingFileHandler(
+                LOG_FILE, when="midnight", encoding="utf-8"
+            ),
             logging.StreamHandler()
         ]
     )
     logging.info("=" * 50)
-    logging.info(f"Script started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logging.info("Script started at %s", datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     logging.info("=" * 50)
-    clean_old_logs()
 
-def clean_old_logs():
+def read_json(path):
     """
-    Remove log entries older than LOG_RETENTION_DAYS.
-    Taking into account microseconds in the log: 'YYYY-MM-DD HH:MM:SS,fff'
+    Read a JSON file.
     """
-    try:
-        if not os.path.exists(LOG_FILE):
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def write_json(path, data, mode=0o666):
+    """
+    Atomically write data to a JSON file (compact), via a temp file and os.replace.
+    """
+    payload = orjson.dumps(data) if orjson else json.dumps(data, separators=(",", ":")).encode()
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+class StateDB:
+    """
+    Processed meetings and uploaded files, stored in SQLite (WAL mode).
+    Meeting marks are buffered and written in batches of STATE_FLUSH_EVERY.
+    """
+
+    def __init__(self, path=STATE_DB_FILE):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed (meeting_id TEXT PRIMARY KEY, processed_at TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "file_id TEXT PRIMARY KEY, meeting_id TEXT NOT NULL, file_size INTEGER, drive_id TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._pending = {}
+        self._migrate_json_state()
+
+    def _migrate_json_state(self):
+        """
+        Import the legacy JSON state file on the first run with an empty DB.
+        """
+        if not os.path.exists(STATE_FILE):
+            return
+        if self._conn.execute("SELECT 1 FROM processed LIMIT 1").fetchone():
             return
-        cutoff_date = datetime.now() - timedelta(days=LOG_RETENTION_DAYS)
-        updated_lines = []
+        state = read_json(STATE_FILE)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed (meeting_id, processed_at) VALUES (?, ?)",
+                [(str(meeting_id), info.get("processed_at", "")) for meeting_id, info in state.items()]
+            )
+        logging.info("Migrated %s processed recordings from %s", len(state), STATE_FILE)
 
-        with open(LOG_FILE, "r") as log_file:
-            lines = log_file.readlines()
+    def seen_ids(self):
+        """
+        Return the ids of all processed meetings.
+        """
+        self.flush()
+        return frozenset(row[0] for row in self._conn.execute("SELECT meeting_id FROM processed"))
 
-        for line in lines:
-            parts = line.split(" - ")
-            if len(parts) < 2:
-                updated_lines.append(line)
-                continue
+    def mark(self, meeting_id):
+        """
+        Mark the meeting as processed.
+        """
+        self._pending[str(meeting_id)] = datetime.now().isoformat()
+        if len(self._pending) >= STATE_FLUSH_EVERY:
+            self.flush()
 
-            timestamp_str = parts[0].strip()  # e.g. 2025-01-15 13:34:06,568
-            try:
-                dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S,%f")
-            except ValueError:
-                try:
-                    dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    updated_lines.append(line)
-                    continue
+    def get_meta(self, key):
+        """
+        Return a stored run-to-run value, or None.
+        """
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
 
-            if dt >= cutoff_date:
-                updated_lines.append(line)
+    def set_meta(self, key, value):
+        """
+        Store a run-to-run value (written immediately).
+        """
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
 
-        with open(LOG_FILE, "w") as log_file:
-            log_file.writelines(updated_lines)
-    except Exception as e:
-        logging.error(f"Failed to clean old logs: {e}")
+    def file_uploaded(self, file_id, file_size=None):
+        """
+        Return True if this Zoom file (same id and size) is already on Drive.
+        """
+        row = self._conn.execute("SELECT file_size FROM files WHERE file_id = ?", (file_id,)).fetchone()
+        return row is not None and (file_size is None or row[0] == file_size)
+
+    def mark_file(self, meeting_id, file_id, file_size, drive_id):
+        """
+        Record an uploaded Zoom file and its Drive id (written immediately).
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (file_id, meeting_id, file_size, drive_id) VALUES (?, ?, ?, ?)",
+                (file_id, str(meeting_id), file_size, drive_id)
+            )
+
+    def flush(self):
+        """
+        Write buffered marks to the DB.
+        """
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO processed (meeting_id, processed_at) VALUES (?, ?)",
+                list(self._pending.items())
+            )
+        self._pending.clear()
+
+    def close(self):
+        """
+        Flush buffered marks, fold the WAL back into the DB file and close it.
+        """
+        self.flush()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.close()
 
-def load_state():
+def load_folder_cache():
     """
-    Load the processed recordings state from file.
+    Load the Drive folder-id cache from file; an unreadable file starts an empty cache.
     """
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    if not os.path.exists(FOLDER_CACHE_FILE):
+        return
+    try:
+        cache = {
+            (parent_id, folder_name): folder_id
+            for parent_id, folders in read_json(FOLDER_CACHE_FILE).items()
+            for folder_name, folder_id in folders.items()
+        }
+    except (OSError, ValueError, AttributeError) as e:
+        logging.warning("Ignoring unreadable folder cache %s: %s", FOLDER_CACHE_FILE, e)
+        return
+    _folder_cache.update(cache)
 
-def save_state(state):
+def save_folder_cache():
     """
-    Save the processed recordings state to file.
+    Save the Drive folder-id cache to file as {parent_id: {folder_name: folder_id}}.
+    _folder_save_lock serializes saves, so workers never share the temp file.
     """
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=4)
+    with _folder_save_lock:
+        tree = {}
+        with _folder_lock:
+            for (parent_id, folder_name), folder_id in _folder_cache.items():
+                tree.setdefault(parent_id, {})[folder_name] = folder_id
+        write_json(FOLDER_CACHE_FILE, tree)
 
 def load_run_count():
     """
     Load the run count from file.
     """
     if os.path.exists(RUN_COUNT_FILE):
-        with open(RUN_COUNT_FILE, "r") as f:
-            return json.load(f).get("run_count", 0)
+        return read_json(RUN_COUNT_FILE).get("run_count", 0)
     return 0
 
 def save_run_count(run_count):
     """
     Save the run count to file.
     """
-    with open(RUN_COUNT_FILE, "w") as f:
-        json.dump({"run_count": run_count}, f, indent=4)
+    write_json(RUN_COUNT_FILE, {"run_count": run_count})
 
-def get_zoom_access_token():
+# Zoom access token: {"client_id": ..., "token": ..., "exp": <unix time>}; persisted to TOKEN_CACHE_FILE
+_token_cache = {}
+_token_lock = threading.Lock()
+
+def load_token_cache():
+    """
+    Load the cached Zoom access token from file (ignored if issued for another app).
+    """
+    if os.path.exists(TOKEN_CACHE_FILE):
+        cached = read_json(TOKEN_CACHE_FILE)
+        if cached.get("client_id") == ZOOM_CLIENT_ID:
+            _token_cache.update(cached)
+
+def save_token_cache():
+    """
+    Save the cached Zoom access token to file, readable by the owner only.
+    """
+    write_json(TOKEN_CACHE_FILE, _token_cache, mode=0o600)
+
+def request_zoom_access_token():
     """
     Generate Zoom access token using client_id, client_secret, and account_id.
+    Return (token, expiry as unix time).
     """
     url = "https://zoom.us/oauth/token"
     headers = {
@@ -141,19 +341,62 @@ def get_zoom_access_token():
         "Content-Type": "application/x-www-form-urlencoded"
     }
     payload = {"grant_type": "account_credentials", "account_id": ZOOM_ACCOUNT_ID}
-    response = requests.post(url, headers=headers, data=payload)
+    response = get_zoom_session().post(url, headers=headers, data=payload)
     response.raise_for_status()
-    return response.json().get("access_token")
+    data = response.json()
+    return data.get("access_token"), time.time() + data.get("expires_in", 3600)
+
+def get_zoom_access_token(force_refresh=False, rejected_token=None):
+    """
+    Return a Zoom access token, reusing the cached one until TOKEN_REFRESH_MARGIN
+    seconds before it expires. force_refresh fetches a new one, unless the
+    rejected_token it replaces was already refreshed by another thread.
+    """
+    with _token_lock:
+        if not _token_cache:
+            load_token_cache()
+        if time.time() < _token_cache.get("exp", 0) - TOKEN_REFRESH_MARGIN:
+            if not force_refresh or (rejected_token and _token_cache["token"] != rejected_token):
+                return _token_cache["token"]
+
+        token, exp = request_zoom_access_token()
+        _token_cache.update(client_id=ZOOM_CLIENT_ID, token=token, exp=exp)
+        save_token_cache()
+        return token
+
+def zoom_auth_headers():
+    """
+    Authorization header for Zoom API/download requests.
+    """
+    return {"Authorization": f"Bearer {get_zoom_access_token()}"}
+
+def reauth_on_401(response, *args, **kwargs):
+    """
+    Zoom session response hook: on 401, refresh the token and re-send the request once.
+    """
+    request = response.request
+    if (response.status_code != 401
+            or not request.headers.get("Authorization", "").startswith("Bearer ")
+            or getattr(request, "reauthenticated", False)):
+        return response
+
+    logging.warning("401 Unauthorized -> refreshing Zoom token.")
+    rejected_token = request.headers["Authorization"][len("Bearer "):]
+    retry = request.copy()
+    retry.headers["Authorization"] = f"Bearer {get_zoom_access_token(force_refresh=True, rejected_token=rejected_token)}"
+    retry.reauthenticated = True
+    response.close()
+    return get_zoom_session().send(retry, **kwargs)
 
 # -------------------------------------------------------------------------
 # Download/Upload Functions
 # -------------------------------------------------------------------------
-def fetch_zoom_recordings_page(token, from_date, to_date, next_page_token=None, mc=False):
+def fetch_zoom_recordings_page(from_date, to_date, next_page_token=None, mc=False):
     """
     Retrieve one page of Zoom recordings (page_size=300).
     """
     url = "https://api.zoom.us/v2/accounts/me/recordings"
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = zoom_auth_headers()
     params = {
         "from": from_date,
         "to": to_date,
@@ -164,18 +407,18 @@ def fetch_zoom_recordings_page(token, from_date, to_date, next_page_token=None,
     if next_page_token:
         params["next_page_token"] = next_page_token
 
-    resp = requests.get(url, headers=headers, params=params)
+    resp = get_zoom_session().get(url, headers=headers, params=params)
     resp.raise_for_status()
     return resp.json()
 
-def fetch_zoom_recordings(token, from_date, to_date, mc=False):
+def fetch_zoom_recordings(from_date, to_date, mc=False):
     """
     Paginated retrieval of recordings in [from_date, to_date].
     """
     all_meetings = []
     next_page_token = None
     while True:
-        data = fetch_zoom_recordings_page(token, from_date, to_date, next_page_token, mc=mc)
+        data = fetch_zoom_recordings_page(from_date, to_date, next_page_token, mc=mc)
         meetings = data.get("meetings", [])
         all_meetings.extend(meetings)
         next_page_token = data.get("next_page_token")
@@ -183,125 +426,422 @@ def fetch_zoom_recordings(token, from_date, to_date, mc=False):
             break
     return all_meetings
 
-def fetch_zoom_recordings_in_chunks(token, start_date, end_date, mc=False):
+def month_windows(start_date, end_date):
     """
-    Split requests by 1-month chunks to ensure we don't skip anything.
+    Split [start_date, end_date] into 1-month (from, to) date-string windows.
     """
-    all_meetings = []
+    windows = []
     current_start = start_date
     while current_start < end_date:
         current_end = current_start + relativedelta(months=1)
         if current_end > end_date:
             current_end = end_date
 
-        from_str = current_start.strftime("%Y-%m-%d")
-        to_str   = current_end.strftime("%Y-%m-%d")
-
-        chunk_meetings = fetch_zoom_recordings(token, from_str, to_str, mc=mc)
-        all_meetings.extend(chunk_meetings)
+        windows.append((current_start.strftime("%Y-%m-%d"), current_end.strftime("%Y-%m-%d")))
         current_start = current_end + timedelta(days=1)
-    return all_meetings
+    return windows
+
+def fetch_zoom_recordings_in_chunks(start_date, end_date, mc=False):
+    """
+    Split requests by 1-month chunks to ensure we don't skip anything.
+    Chunks are fetched concurrently; results keep chronological chunk order.
+    """
+    windows = month_windows(start_date, end_date)
+    if not windows:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(ZOOM_LIST_WORKERS, len(windows))) as pool:
+        chunks = pool.map(lambda w: fetch_zoom_recordings(w[0], w[1], mc=mc), windows)
+        return list(itertools.chain.from_iterable(chunks))
 
 def sanitize_filename(filename):
     """
     Remove invalid characters from filename.
     """
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', filename)
-    sanitized = sanitized.replace("'", "")
-    sanitized = sanitized.replace("&", "and")
-    sanitized = sanitized.replace("%", "percent")
-    sanitized = sanitized.replace(" ", "_")
-    return sanitized.strip()
+    return _INVALID_FILENAME_RE.sub("", filename).translate(_FILENAME_TRANSLATION).strip()
+
+# (parent_id, folder_name) -> folder_id; persisted to FOLDER_CACHE_FILE between runs
+_folder_cache = {}
+# Parents whose sub-folders have all been listed into _folder_cache during this run
+_listed_parents = set()
+_folder_lock = threading.RLock()
+_folder_save_lock = threading.Lock()
+_new_folders = 0
 
-def create_folder_on_google_drive(folder_name, parent_id=None):
+def escape_query_value(value):
     """
-    Create/find folder on Google Drive (with trashed=false).
+    Escape a string for use inside single quotes in a Drive files.list query.
     """
-    query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
-    if parent_id:
-        query += f" and '{parent_id}' in parents"
-
-    logging.debug(f"[GDRIVE] Query: {query}")
-    resp = drive_service.files().list(
-        q=query,
-        spaces="drive",
-        fields="files(id, name, parents)",
-        supportsAllDrives=True,
-        includeItemsFromAllDrives=True
-    ).execute()
-    files = resp.get("files", [])
-
-    if files:
-        folder_id = files[0]['id']
-        logging.debug(f"[GDRIVE] Folder '{folder_name}' exists: {folder_id}")
-        return folder_id
-    else:
-        file_metadata = {
-            "name": folder_name,
-            "mimeType": "application/vnd.google-apps.folder"
-        }
-        if parent_id:
-            file_metadata["parents"] = [parent_id]
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+def cache_folder(parent_id, folder_name, folder_id):
+    """
+    Remember a folder id; save the cache every FOLDER_CACHE_FLUSH_EVERY new ids.
+    Called without _folder_lock held, so the file write does not block other workers.
+    """
+    global _new_folders
+    with _folder_lock:
+        _folder_cache[(parent_id, folder_name)] = folder_id
+        _new_folders += 1
+        save_due = _new_folders % FOLDER_CACHE_FLUSH_EVERY == 0
+    if save_due:
+        save_folder_cache()
+
+def cache_listed_folders(parent_id, folders, complete=True):
+    """
+    Cache the sub-folders listed under parent_id. A complete listing also
+    validates the cache: ids persisted by earlier runs that are no longer
+    under parent_id are dropped, and the parent counts as listed.
+    """
+    found = {}  # folder_name -> [folder_id, ...]
+    for folder in folders:
+        found.setdefault(folder["name"], []).append(folder["id"])
+    with _folder_lock:
+        if complete:
+            for key in [key for key in _folder_cache if key[0] == parent_id and key[1] not in found]:
+                del _folder_cache[key]
+        for folder_name, folder_ids in found.items():
+            cached = _folder_cache.get((parent_id, folder_name))
+            if cached not in folder_ids:
+                _folder_cache[(parent_id, folder_name)] = folder_ids[0]
+        if complete:
+            _listed_parents.add(parent_id)
+
+def list_folders_on_google_drive(parent_id):
+    """
+    Cache every sub-folder of parent_id with a single (paginated) files.list query.
+    """
+    query = f"mimeType='{FOLDER_MIME_TYPE}' and '{escape_query_value(parent_id)}' in parents and trashed=false"
+    logging.debug("[GDRIVE] Query: %s", query)
+    folders = []
+    page_token = None
+    while True:
+        resp = get_drive_service().files().list(
+            q=query,
+            spaces="drive",
+            fields="nextPageToken, files(id, name)",
+            pageSize=1000,
+            pageToken=page_token,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ).execute(num_retries=DRIVE_NUM_RETRIES)
+        folders.extend(resp.get("files", []))
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+    cache_listed_folders(parent_id, folders)
+
+def parse_start_time(start_time):
+    """
+    Parse a Zoom start_time (ISO-8601 UTC, e.g. 2025-01-15T13:34:06Z) into a naive datetime.
+    """
+    return datetime.fromisoformat(start_time[:19])
+
+def recording_folder(recording):
+    """
+    Return (meeting_folder, year, month) of the Drive folder for a Zoom recording.
+    """
+    folder_name = sanitize_filename(
+        f"{recording['topic']}_{recording['host_email']}_{recording['start_time'][:10]}"
+    )
+    dt_meet = parse_start_time(recording["start_time"])
+    return folder_name, dt_meet.year, dt_meet.month
+
+def execute_drive_batch(requests_by_id, callback):
+    """
+    Execute Drive requests as batch HTTP requests of up to DRIVE_BATCH_SIZE calls.
+    callback(request_id, response, exception) is invoked once per request.
+    """
+    items = list(requests_by_id.items())
+    for i in range(0, len(items), DRIVE_BATCH_SIZE):
+        batch = get_drive_service().new_batch_http_request(callback=callback)
+        for request_id, request in items[i:i + DRIVE_BATCH_SIZE]:
+            batch.add(request, request_id=request_id)
+        batch.execute()
+
+def batch_list_folders(parent_ids):
+    """
+    List the sub-folders of several parents in batched files.list calls.
+    """
+    parent_ids = [p for p in parent_ids if p not in _listed_parents]
+    service = get_drive_service()
+    requests_by_id = {}
+    for i, parent_id in enumerate(parent_ids):
+        requests_by_id[str(i)] = service.files().list(
+            q=f"mimeType='{FOLDER_MIME_TYPE}' and '{escape_query_value(parent_id)}' in parents and trashed=false",
+            spaces="drive",
+            fields="nextPageToken, files(id, name)",
+            pageSize=1000,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        )
+
+    def on_list(request_id, response, exception):
+        parent_id = parent_ids[int(request_id)]
+        if exception is not None:
+            logging.warning("[GDRIVE] Batch listing of %s failed: %s", parent_id, exception)
+            return
+        # Truncated listings are completed lazily by create_folder_on_google_drive
+        cache_listed_folders(parent_id, response.get("files", []), complete=not response.get("nextPageToken"))
+
+    execute_drive_batch(requests_by_id, on_list)
 
-        new_folder = drive_service.files().create(
-            body=file_metadata,
+def batch_create_folders(keys):
+    """
+    Create the (parent_id, folder_name) folders in batched files.create calls.
+    """
+    service = get_drive_service()
+    requests_by_id = {}
+    for i, (parent_id, folder_name) in enumerate(keys):
+        requests_by_id[str(i)] = service.files().create(
+            body={"name": folder_name, "mimeType": FOLDER_MIME_TYPE, "parents": [parent_id]},
             fields="id",
             supportsAllDrives=True
-        ).execute()
-        folder_id = new_folder["id"]
-        logging.debug(f"[GDRIVE] Created folder '{folder_name}' -> {folder_id}")
+        )
+
+    def on_create(request_id, response, exception):
+        parent_id, folder_name = keys[int(request_id)]
+        if exception is not None:
+            logging.warning("[GDRIVE] Batch creation of '%s' failed: %s", folder_name, exception)
+            return
+        cache_folder(parent_id, folder_name, response["id"])
+        # A new folder is empty, so there is nothing to list under it
+        _listed_parents.add(response["id"])
+        logging.debug("[GDRIVE] Created folder '%s' -> %s", folder_name, response['id'])
+
+    execute_drive_batch(requests_by_id, on_create)
+
+def prepare_folder_tree(recordings):
+    """
+    Resolve all year/month/meeting folders needed by the recordings up front,
+    one tree level at a time: a batch of lookups, then a batch of creates.
+    Listing a parent also validates the folder ids cached under it by earlier
+    runs, so only the root, year and month folders this run needs are checked.
+    Folders are only batch-created under parents whose listing completed;
+    anything else is left to create_folder_on_google_drive, which checks
+    for an existing folder first.
+    """
+    tree = {}
+    for recording in recordings:
+        if not any(f.get("download_url") for f in recording.get("recording_files", [])):
+            continue
+        folder_name, year, month = recording_folder(recording)
+        tree.setdefault(str(year), {}).setdefault(f"{month:02d}", {}).setdefault(folder_name, {})
+
+    level = {GOOGLE_DRIVE_PARENT_ID: tree}  # parent_id -> {folder_name: sub-tree}
+    while level:
+        batch_list_folders(list(level))
+        batch_create_folders([
+            (parent_id, folder_name)
+            for parent_id, children in level.items()
+            if parent_id in _listed_parents
+            for folder_name in children
+            if (parent_id, folder_name) not in _folder_cache
+        ])
+
+        next_level = {}
+        for parent_id, children in level.items():
+            for folder_name, subtree in children.items():
+                folder_id = _folder_cache.get((parent_id, folder_name))
+                if folder_id and subtree:
+                    next_level[folder_id] = subtree
+        level = next_level
+
+def create_folder_on_google_drive(folder_name, parent_id):
+    """
+    Create/find folder on Google Drive (with trashed=false).
+    Results are memoized per (parent_id, folder_name); the first miss under a
+    parent lists all of its sub-folders at once.
+    """
+    key = (parent_id, folder_name)
+    folder_id = _folder_cache.get(key)
+    if folder_id:
         return folder_id
 
-def upload_to_google_drive(file_path, file_name, year, month, meeting_folder):
+    with _folder_lock:
+        folder_id = _folder_cache.get(key)
+        if folder_id:
+            return folder_id
+
+        if parent_id not in _listed_parents:
+            list_folders_on_google_drive(parent_id)
+            folder_id = _folder_cache.get(key)
+
+        if folder_id:
+            logging.debug("[GDRIVE] Folder '%s' exists: %s", folder_name, folder_id)
+        else:
+            file_metadata = {
+                "name": folder_name,
+                "mimeType": FOLDER_MIME_TYPE,
+                "parents": [parent_id]
+            }
+
+            new_folder = get_drive_service().files().create(
+                body=file_metadata,
+                fields="id",
+                supportsAllDrives=True
+            ).execute(num_retries=DRIVE_NUM_RETRIES)
+            folder_id = new_folder["id"]
+            _listed_parents.add(folder_id)
+            logging.debug("[GDRIVE] Created folder '%s' -> %s", folder_name, folder_id)
+
+        # Publish the id before releasing the lock so no other worker creates it again
+        _folder_cache[key] = folder_id
+
+    cache_folder(parent_id, folder_name, folder_id)
+    return folder_id
+
+@functools.lru_cache(maxsize=4096)
+def get_month_folder_id(year, month):
     """
-    Upload file: /<PARENT>/<year>/<month>/<meeting_folder>/<file_name>
+    Resolve (creating if needed) /<PARENT>/<year>/<month>.
     """
     year_folder_id = create_folder_on_google_drive(str(year), GOOGLE_DRIVE_PARENT_ID)
-    month_folder_id = create_folder_on_google_drive(f"{month:02d}", year_folder_id)
-    meeting_folder_id = create_folder_on_google_drive(meeting_folder, month_folder_id)
+    return create_folder_on_google_drive(f"{month:02d}", year_folder_id)
+
+def get_meeting_folder_id(year, month, meeting_folder):
+    """
+    Resolve (creating if needed) /<PARENT>/<year>/<month>/<meeting_folder>.
+    """
+    return create_folder_on_google_drive(meeting_folder, get_month_folder_id(year, month))
+
+def guess_mime(file_name):
+    """
+    Guess the MIME type of a recording file from its extension.
+    """
+    return mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+class ZoomStreamUpload(MediaUpload):
+    """
+    Resumable media body that reads a Zoom download stream of unknown size.
+    Bytes not yet committed by Drive are kept so a chunk can be re-sent.
+    """
+
+    def __init__(self, stream, mimetype, chunksize=UPLOAD_CHUNK_SIZE):
+        super().__init__()
+        self._stream = stream
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._buffer = bytearray()
+        self._buffer_start = 0  # stream offset of self._buffer[0]
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return None
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def getbytes(self, begin, length):
+        # Drive never asks again for bytes before `begin`
+        del self._buffer[:begin - self._buffer_start]
+        self._buffer_start = begin
+        while len(self._buffer) < length:
+            data = self._stream.read(length - len(self._buffer))
+            if not data:
+                break
+            self._buffer += data
+        return bytes(self._buffer[:length])
+
+class ChunkQueueReader:
+    """
+    File-like reader over byte chunks put on a queue by another thread.
+    None on the queue marks EOF; an exception is re-raised to the reader.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._current = memoryview(b"")
+        self._eof = False
 
-    file_metadata = {"name": file_name, "parents": [meeting_folder_id]}
-    media = MediaFileUpload(file_path, resumable=True)
-    uploaded_file = drive_service.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields="id",
-        supportsAllDrives=True
-    ).execute()
-    logging.info(f"File {file_name} uploaded with ID: {uploaded_file['id']}")
+    def read(self, size):
+        if not self._current:
+            if self._eof:
+                return b""
+            item = self._chunks.get()
+            if item is None:
+                self._eof = True
+                return b""
+            if isinstance(item, BaseException):
+                raise item
+            self._current = memoryview(item)
+        data = self._current[:size].tobytes()
+        self._current = self._current[size:]
+        return data
 
-def download_file(download_url, token, file_path):
+def pump_zoom_download(response, chunks, stop):
     """
-    Download a Zoom recording file. Return True if success, False if token refresh needed.
+    Producer: read a streaming Zoom response into the chunks queue until EOF,
+    an error, or stop being set by the consumer.
     """
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
     try:
-        with requests.get(download_url, headers={"Authorization": f"Bearer {token}"}, stream=True) as r:
-            r.raise_for_status()
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            logging.warning("401 Unauthorized -> need token refresh.")
-            return False
-        else:
-            raise
-    return True
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if not put(chunk):
+                return
+        put(None)
+    except Exception as e:
+        put(e)
+
+def stream_zoom_to_drive(download_url, file_name, year, month, meeting_folder):
+    """
+    Stream a Zoom recording file straight into /<PARENT>/<year>/<month>/<meeting_folder>/<file_name>
+    without touching local disk. Return the Drive file id.
+    """
+    meeting_folder_id = get_meeting_folder_id(year, month, meeting_folder)
+    with get_zoom_session().get(download_url, headers=zoom_auth_headers(), stream=True) as r:
+        r.raise_for_status()
+        # A producer thread keeps downloading while this thread uploads
+        chunks = queue.Queue(maxsize=STREAM_QUEUE_CHUNKS)
+        stop = threading.Event()
+        threading.Thread(target=pump_zoom_download, args=(r, chunks, stop), daemon=True).start()
+        try:
+            request = get_drive_service().files().create(
+                body={"name": file_name, "parents": [meeting_folder_id]},
+                media_body=ZoomStreamUpload(ChunkQueueReader(chunks), guess_mime(file_name)),
+                fields="id",
+                supportsAllDrives=True
+            )
+            uploaded_file = None
+            while uploaded_file is None:
+                status, uploaded_file = request.next_chunk(num_retries=DRIVE_NUM_RETRIES)
+                if status:
+                    logging.debug("[GDRIVE] %s: %s bytes uploaded", file_name, status.resumable_progress)
+        finally:
+            stop.set()
+    logging.info("File %s uploaded with ID: %s", file_name, uploaded_file['id'])
+    return uploaded_file["id"]
 
 # -------------------------------------------------------------------------
 # Deletion logic
 # -------------------------------------------------------------------------
-def delete_zoom_recording(token, meeting_id):
+def delete_zoom_recording(meeting_id):
     """
     Delete ALL Zoom recordings for the given meetingId (the entire meeting).
     """
     url = f"https://api.zoom.us/v2/meetings/{meeting_id}/recordings"
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.delete(url, headers=headers)
+    headers = zoom_auth_headers()
+    resp = get_zoom_session().delete(url, headers=headers)
     resp.raise_for_status()  # Raise if error
-    logging.info(f"Deleted recordings for meeting: {meeting_id}")
+    logging.info("Deleted recordings for meeting: %s", meeting_id)
 
-def delete_old_recordings(token):
+def delete_old_recordings():
     """
     Fetch all recordings older than DELETE_AFTER_DAYS across the entire account,
     then delete them from Zoom.
@@ -313,97 +853,166 @@ def delete_old_recordings(token):
     start_date = datetime(2020, 1, 1)
     end_date = delete_cutoff
 
-    all_old_meetings = fetch_zoom_recordings_in_chunks(token, start_date, end_date, mc=False)
-    logging.info(f"Found {len(all_old_meetings)} recordings older than {DELETE_AFTER_DAYS} days.")
+    all_old_meetings = fetch_zoom_recordings_in_chunks(start_date, end_date, mc=False)
+    logging.info("Found %s recordings older than %s days.", len(all_old_meetings), DELETE_AFTER_DAYS)
 
-    for recording in tqdm(all_old_meetings, desc="Deleting old recordings"):
-        meeting_id = recording["id"]
-        # Double-check date
-        st_str = recording["start_time"][:19]
-        try:
-            dt_meeting = datetime.strptime(st_str, "%Y-%m-%dT%H:%M:%S")
-        except ValueError:
-            dt_meeting = datetime.strptime(st_str, "%Y-%m-%d %H:%M:%S")
+    # Double-check date; ISO-8601 timestamps sort lexicographically, so compare strings
+    cutoff_str = delete_cutoff.strftime("%Y-%m-%dT%H:%M:%S")
+    meeting_ids = [r["id"] for r in all_old_meetings if r["start_time"][:19] < cutoff_str]
 
-        if dt_meeting < delete_cutoff:
+    # Zoom has no bulk delete; run the DELETE calls concurrently instead
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+        jobs = {pool.submit(delete_zoom_recording, meeting_id): meeting_id for meeting_id in meeting_ids}
+        for future in tqdm(as_completed(jobs), total=len(jobs), desc="Deleting old recordings",
+                           mininterval=PROGRESS_MININTERVAL, miniters=max(1, len(jobs) // 100)):
             try:
-                delete_zoom_recording(token, meeting_id)
+                future.result()
             except Exception as e:
-                logging.error(f"Error deleting {meeting_id}: {e}")
+                logging.error("Error deleting %s: %s", jobs[future], e)
     logging.info("Deletion of old recordings complete.")
 
 
 # -------------------------------------------------------------------------
 # Main logic
 # -------------------------------------------------------------------------
+def transfer_recordings(state, recordings):
+    """
+    Stream all files of the recordings to Drive and mark completed meetings.
+    Recurring meetings share an id, so each occurrence (uuid) is transferred
+    and the meeting is marked once all of its occurrences are complete.
+    Return {meeting_id: start_time} of meetings with at least one failed file.
+    """
+    unique = {}
+    for recording in recordings:
+        if recording["uuid"] in unique:
+            logging.info("Skipping duplicate recording of %s at %s", recording["id"], recording["start_time"])
+        else:
+            unique[recording["uuid"]] = recording
+    recordings = list(unique.values())
+
+    # Files are streamed Zoom -> Drive on a pool of workers; each transfer
+    # uploads chunks while the rest of the file is still downloading.
+    # jobs: future -> (recording, file_name, file_info)
+    jobs = {}
+    files_left = {}  # uuid -> files still transferring
+    occurrences_left = Counter(recording["id"] for recording in recordings)
+    failed_meetings = {}
+
+    with ThreadPoolExecutor(max_workers=TRANSFER_WORKERS) as pool, \
+            tqdm(total=len(recordings), desc="Processing recordings",
+                 mininterval=PROGRESS_MININTERVAL, miniters=max(1, len(recordings) // 100)) as pbar:
+
+        def occurrence_done(meeting_id):
+            pbar.update(1)
+            occurrences_left[meeting_id] -= 1
+            if occurrences_left[meeting_id]:
+                return
+            if meeting_id in failed_meetings:
+                logging.warning("Meeting %s incomplete, will retry on next run.", meeting_id)
+            else:
+                state.mark(meeting_id)
+
+        for recording in recordings:
+            meeting_id = recording["id"]
+            folder_name, year, month = recording_folder(recording)
+
+            # Queue transfers
+            queued = 0
+            for file_info in recording.get("recording_files", []):
+                download_url = file_info.get("download_url")
+                if not download_url:
+                    logging.warning("Invalid file in %s, skipping.", meeting_id)
+                    continue
+
+                extension = f".{file_info['file_type'].lower()}" if file_info.get("file_type") else ".bin"
+                # folder_name is already sanitized; only the new suffix needs it
+                file_name = f"{folder_name}_{sanitize_filename(file_info['id'] + extension)}"
+
+                if state.file_uploaded(file_info["id"], file_info.get("file_size")):
+                    logging.info("Skipping already uploaded file: %s", file_name)
+                    continue
+
+                future = pool.submit(
+                    stream_zoom_to_drive, download_url, file_name, year, month, folder_name
+                )
+                jobs[future] = (recording, file_name, file_info)
+                queued += 1
+
+            if queued:
+                files_left[recording["uuid"]] = queued
+            else:
+                occurrence_done(meeting_id)
+
+        # A meeting is marked processed once every file of every occurrence is
+        # uploaded; otherwise the next run retries it, skipping the files already on Drive.
+        for future in as_completed(jobs):
+            recording, file_name, file_info = jobs[future]
+            meeting_id = recording["id"]
+            try:
+                drive_id = future.result()
+                state.mark_file(meeting_id, file_info["id"], file_info.get("file_size"), drive_id)
+            except Exception as e:
+                logging.error("Error processing file %s: %s", file_name, e)
+                failed_meetings[meeting_id] = min(
+                    recording["start_time"], failed_meetings.get(meeting_id, recording["start_time"])
+                )
+
+            files_left[recording["uuid"]] -= 1
+            if not files_left[recording["uuid"]]:
+                occurrence_done(meeting_id)
+    return failed_meetings
+
+
 def process_recordings():
     """
-    1) First run => all recordings from 2020; else => last PROCESSING_DAYS days
+    1) First run => all recordings from 2020; else => last PROCESSING_DAYS days,
+       starting no earlier than WATERMARK_OVERLAP_DAYS before the newest
+       recording already handled. A failed recording holds the watermark at
+       its start_time, so while one file keeps failing every run re-lists the
+       full PROCESSING_DAYS window; after that it drops out and is not retried.
     2) Download, upload, mark state
     3) DOES NOT do any deletion here by design (user wants separate mode).
     """
-    state = load_state()
+    state = StateDB()
+    atexit.register(state.close)
+    load_folder_cache()
+    atexit.register(save_folder_cache)
     run_count = load_run_count() + 1
     save_run_count(run_count)
 
+    end_date = datetime.now()
     if run_count == 1:
         logging.info("First run: process all available recordings.")
         start_date = datetime(2020, 1, 1)
     else:
-        logging.info(f"Run #{run_count}: last {PROCESSING_DAYS} days.")
-        start_date = datetime.now() - timedelta(days=PROCESSING_DAYS)
+        logging.info("Run #%s: last %s days.", run_count, PROCESSING_DAYS)
+        start_date = end_date - timedelta(days=PROCESSING_DAYS)
+        # Start from the newest recording already handled (minus an overlap
+        # for late-finishing cloud recordings) so Zoom only returns new ones
+        watermark = state.get_meta("max_start_time")
+        if watermark:
+            start_date = max(start_date, parse_start_time(watermark) - timedelta(days=WATERMARK_OVERLAP_DAYS))
+    fetched = fetch_zoom_recordings_in_chunks(start_date, end_date, mc=False)
 
-    end_date = datetime.now()
-    token = get_zoom_access_token()
-    recordings = fetch_zoom_recordings_in_chunks(token, start_date, end_date, mc=False)
+    seen = state.seen_ids()
+    recordings = [r for r in fetched if str(r["id"]) not in seen]
+    logging.info("Skipping %s already processed meetings.", len(fetched) - len(recordings))
 
+    failed_meetings = {}
     if not recordings:
-        logging.info("No recordings found.")
-        return
-
-    for recording in tqdm(recordings, desc="Processing recordings"):
-        meeting_id = recording["id"]
-        if meeting_id in state:
-            logging.info(f"Skipping processed meeting: {meeting_id}")
-            continue
-
-        folder_name = sanitize_filename(
-            f"{recording['topic']}_{recording['host_email']}_{recording['start_time'][:10]}"
-        )
-        # Parse date/time to get year & month
-        st_str = recording["start_time"][:19]
+        logging.info("No new recordings found.")
+    else:
         try:
-            dt_meet = datetime.strptime(st_str, "%Y-%m-%dT%H:%M:%S")
-        except ValueError:
-            dt_meet = datetime.strptime(st_str, "%Y-%m-%d %H:%M:%S")
-        year, month = dt_meet.year, dt_meet.month
-
-        # Download files
-        for file_info in recording.get("recording_files", []):
-            download_url = file_info.get("download_url")
-            if not download_url:
-                logging.warning(f"Invalid file in {meeting_id}, skipping.")
-                continue
-
-            extension = f".{file_info['file_type'].lower()}" if file_info.get("file_type") else ".bin"
-            file_name = sanitize_filename(f"{folder_name}_{file_info['id']}{extension}")
-            file_path = os.path.join(DOWNLOAD_DIR, file_name)
-
-            try:
-                success = download_file(download_url, token, file_path)
-                if not success:
-                    token = get_zoom_access_token()
-                    success = download_file(download_url, token, file_path)
-                if success:
-                    upload_to_google_drive(file_path, file_name, year, month, folder_name)
-                    os.remove(file_path)
-                else:
-                    logging.error(f"Failed to download after refresh: {file_path}")
-            except Exception as e:
-                logging.error(f"Error processing file {file_name}: {e}")
+            prepare_folder_tree(recordings)
+        except Exception as e:
+            logging.warning("Failed to prepare Drive folders, resolving them per file: %s", e)
+        failed_meetings = transfer_recordings(state, recordings)
 
-        state[meeting_id] = {"processed_at": datetime.now().isoformat()}
-        save_state(state)
+    # Never move the watermark past a meeting that still has to be retried
+    if failed_meetings:
+        state.set_meta("max_start_time", min(failed_meetings.values()))
+    elif fetched:
+        state.set_meta("max_start_time", max(r["start_time"] for r in fetched))
 
 
 def main():
@@ -423,8 +1032,7 @@ def main():
         if args.delete:
             # Only run deletion
             logging.info("Running in delete-only mode.")
-            token = get_zoom_access_token()
-            delete_old_recordings(token)
+            delete_old_recordings()
         else:
             # Normal mode: download new recordings, then delete old
             logging.info("Running in normal mode: download/upload new recordings, then delete old.")
@@ -432,11 +1040,10 @@ def main():
 
             # After we finish downloading, we want to remove old recordings from the entire account
             # that are older than 1 year
-            token = get_zoom_access_token()
-            delete_old_recordings(token)
+            delete_old_recordings()
 
     except Exception as e:
-        logging.critical(f"Critical error occurred: {e}")
+        logging.critical("Critical error occurred: %s", e)
 
     logging.info("Script execution ends.")
 